@@ -36,9 +36,9 @@ class BaseKGCreateTool(BaseModel):
         if not uri:
             return ""
         if self.return_full_uri:
-            return uri
+            return self.model.resolve_URI(uri)
         else:
-            return self.base_uri + uri
+            return self.model.resolve_URI(self.base_uri + uri)
     
     def _shorten_uri(self, uri: str) -> str:
         if not uri:
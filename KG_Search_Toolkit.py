@@ -46,6 +46,19 @@ class BaseKGSearchTool(BaseModel):
         else:
             raise ValueError(f"Unknown result format: {self.result_format}")
 
+    def create_result(self, variables: List[str], rows: List[tuple]) -> Any:
+        """Create a SPARQL SELECT result from rows which are not computed by a query."""
+        from rdflib.query import Result
+        from rdflib.term import Variable
+
+        result = Result("SELECT")
+        result.vars = [Variable(v) for v in variables]
+        result.bindings = [
+            {Variable(v): value for v, value in zip(variables, row) if value is not None}
+            for row in rows
+        ]
+        return result
+
     class Config(BaseTool.Config):
         pass
 
@@ -118,7 +131,7 @@ class SearchPropertyTool(BaseKGSearchTool, BaseTool):
             ?property_id rdfs:range ?range.
             ?range rdfs:label ?range_label.
         }}        
-        """)
+        """, schema_only=True)
 
         return super().format_result(result)
 
@@ -152,10 +165,103 @@ class SearchClassTool(BaseKGSearchTool, BaseTool):
             ?class_id rdfs:label ?label.
             ?class_id rdfs:comment ?comment.
         }}        
-        """)
+        """, schema_only=True)
+
+        return super().format_result(result)
+
+
+ # search properties by domain and range
+
+class _SearchPropertiesByClassesToolInput(BaseModel):
+    subject_class_id: Optional[str] = Field(default="", description="The class URI of the subject. Properties whose domain is this class or one of its super classes are returned.")
+    object_class_id: Optional[str] = Field(default="", description="The class URI of the object. Properties whose range is this class or one of its super classes are returned.")
 
+class SearchPropertiesByClassesTool(BaseKGSearchTool, BaseTool):
+    """Tool for searching properties applicable to a subject and object class in a knowledge graph."""
+
+    name: str = "search_properties_by_classes"
+    description: str = (
+            "Search for properties which can be used between a subject of the given subject class and an object of the given object class (at least one is required). "
+            "It returns the properties with their labels, comments, domains, ranges and identifiers."
+        )
+    args_schema: Type[BaseModel] = _SearchPropertiesByClassesToolInput
+
+    def _run(
+        self,
+        subject_class_id: str = "",
+        object_class_id: str = "",
+        run_manager: Optional[CallbackManagerForToolRun] = None,
+    ) -> str:
+        """Execute the lookup, return the results or an error message."""
+
+        from rdflib.namespace import RDFS
+
+        if not subject_class_id and not object_class_id:
+            return "Provide at least a subject class or an object class."
+        error_message_class = " Search for it with function search_class."
+        if subject_class_id and self.model.URI_is_class(subject_class_id) == False:
+            return "The subject class is not a class in the graph." + error_message_class
+        if object_class_id and self.model.URI_is_class(object_class_id) == False:
+            return "The object class is not a class in the graph." + error_message_class
+
+        schema = self.model.schema_graph
+        rows = [
+            (
+                property_id,
+                schema.value(property_id, RDFS.label),
+                schema.value(property_id, RDFS.comment),
+                schema.value(property_id, RDFS.domain),
+                schema.value(property_id, RDFS.range),
+            )
+            for property_id in self.model.applicable_properties(subject_class_id, object_class_id)
+        ]
+        result = self.create_result(["property_id", "label", "comment", "domain", "range"], rows)
         return super().format_result(result)
 
+
+ # list instances of a class
+
+class _ListInstancesOfClassToolInput(BaseModel):
+    class_id: str = Field(..., description="The class URI whose instances (including instances of its sub classes) should be listed.")
+    page: Optional[int] = Field(default=0, description="The page of the result list starting at 0.")
+
+class ListInstancesOfClassTool(BaseKGSearchTool, BaseTool):
+    """Tool for listing the instances of a class in a knowledge graph."""
+
+    name: str = "list_instances_of_class"
+    description: str = (
+            "Lists the instances of a class in a knowledge graph page by page. It returns the instances with their labels, comments and identifiers."
+        )
+    args_schema: Type[BaseModel] = _ListInstancesOfClassToolInput
+
+    page_size: int = Field(default=20, exclude=True)
+
+    def _run(
+        self,
+        class_id: str,
+        page: int = 0,
+        run_manager: Optional[CallbackManagerForToolRun] = None,
+    ) -> str:
+        """Execute the lookup, return the results or an error message."""
+
+        from rdflib.namespace import RDFS
+
+        if self.model.URI_is_class(class_id) == False:
+            return "The class is not a class in the graph. Search for it with function search_class."
+
+        offset = max(page, 0) * self.page_size
+        instances, total = self.model.instances_of_class(class_id, offset=offset, limit=self.page_size)
+        graph = self.model.graph
+        rows = [
+            (instance_id, graph.value(instance_id, RDFS.label), graph.value(instance_id, RDFS.comment))
+            for instance_id in instances
+        ]
+        result = self.create_result(["instance_id", "label", "comment"], rows)
+        message = f"\n{total} instances in total."
+        if offset + len(instances) < total:
+            message += f" Use page {max(page, 0) + 1} to get more."
+        return super().format_result(result) + message
+
 # Toolkit
 
 class KGSearchToolkit(BaseToolkit):
@@ -175,9 +281,13 @@ class KGSearchToolkit(BaseToolkit):
         search_instance_tool = SearchInstanceTool(model=self.model, result_format=self.result_format)
         search_property_tool = SearchPropertyTool(model=self.model, result_format=self.result_format)
         search_class_tool = SearchClassTool(model=self.model, result_format=self.result_format)
+        search_properties_by_classes_tool = SearchPropertiesByClassesTool(model=self.model, result_format=self.result_format)
+        list_instances_of_class_tool = ListInstancesOfClassTool(model=self.model, result_format=self.result_format)
 
         return [
             search_instance_tool,
             search_property_tool,
-            search_class_tool
+            search_class_tool,
+            search_properties_by_classes_tool,
+            list_instances_of_class_tool
         ]
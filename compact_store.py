@@ -0,0 +1,260 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+import heapq
+import itertools
+
+from rdflib.store import Store
+
+ANY = None
+
+# positions of subject, predicate and object in the key of each permutation
+SPO = (0, 1, 2)
+POS = (1, 2, 0)
+OSP = (2, 0, 1)
+
+
+class CompactStore(Store):
+    """
+    A memory efficient in memory triple store.
+
+    Every term is interned once and mapped to an integer id. Triples are kept as
+    three sorted permutations (SPO, POS, OSP) in array backed columns of these ids,
+    which needs a few dozen bytes per triple instead of several hundred.
+    New triples and removals are collected in a small delta buffer which is merged
+    into the sorted permutations once it grows too large (or when compact is called).
+    Large files should be loaded between start_bulk_load and compact: the triples are
+    then only appended to plain id columns and sorted once.
+    """
+
+    def __init__(
+        self,
+        configuration: Optional[str] = None,
+        identifier: Optional[Any] = None,
+        delta_size: int = 10000,
+    ) -> None:
+        super(CompactStore, self).__init__(configuration)
+        self.identifier = identifier
+        self.delta_size = delta_size
+
+        self._term2id: Dict[Any, int] = {}
+        self._id2term: List[Any] = []
+
+        self._permutations = {order: self._empty_columns() for order in (SPO, POS, OSP)}
+
+        # delta buffer: triples of ids which are added to or removed from the permutations
+        self._added: Set[Tuple[int, int, int]] = set()
+        self._removed: Set[Tuple[int, int, int]] = set()
+        self._added_index: Tuple[Dict[int, Set], Dict[int, Set], Dict[int, Set]] = ({}, {}, {})
+        # unsorted id columns of a bulk load (None if no bulk load is running)
+        self._bulk: Optional[Tuple[array, array, array]] = None
+
+        self._namespace: Dict[str, Any] = {}
+        self._prefix: Dict[Any, str] = {}
+
+    @staticmethod
+    def _empty_columns() -> Tuple[array, array, array]:
+        return (array("I"), array("I"), array("I"))
+
+    def _intern(self, term: Any) -> int:
+        term_id = self._term2id.get(term)
+        if term_id is None:
+            term_id = len(self._id2term)
+            self._term2id[term] = term_id
+            self._id2term.append(term)
+        return term_id
+
+    def _main_contains(self, ids: Tuple[int, int, int]) -> bool:
+        lo, hi = self._range(self._permutations[SPO], ids)
+        return lo < hi
+
+    @staticmethod
+    def _range(columns: Tuple[array, array, array], key: Tuple[int, ...]) -> Tuple[int, int]:
+        """
+        Rows of the sorted columns which start with the given key.
+        """
+        lo, hi = 0, len(columns[0])
+        for column, value in zip(columns, key):
+            lo = bisect_left(column, value, lo, hi)
+            hi = bisect_right(column, value, lo, hi)
+        return lo, hi
+
+    def add(self, triple: Tuple[Any, Any, Any], context: Any, quoted: bool = False) -> None:
+        """
+        Add a triple to the store of triples.
+        """
+        ids = tuple(self._intern(term) for term in triple)
+        if ids in self._removed:
+            self._removed.discard(ids)
+            return
+        if self._bulk is not None:
+            for column, value in zip(self._bulk, ids):
+                column.append(value)
+            return
+        if ids in self._added or self._main_contains(ids):
+            return
+        self._added.add(ids)
+        for position, index in enumerate(self._added_index):
+            index.setdefault(ids[position], set()).add(ids)
+        self._compact_if_needed()
+
+    def start_bulk_load(self) -> None:
+        """
+        Collect the following additions unsorted until compact is called (or the store is read).
+        """
+        if self._bulk is None:
+            self._bulk = self._empty_columns()
+
+    def _finish_bulk_load(self) -> None:
+        if self._bulk is not None:
+            self.compact()
+
+    def remove(self, triple_pattern: Tuple[Any, Any, Any], context: Optional[Any] = None) -> None:
+        self._finish_bulk_load()
+        for ids in list(self._match(triple_pattern)):
+            if ids in self._added:
+                self._added.discard(ids)
+                for position, index in enumerate(self._added_index):
+                    bucket = index[ids[position]]
+                    bucket.discard(ids)
+                    if not bucket:
+                        del index[ids[position]]
+            else:
+                self._removed.add(ids)
+        self._compact_if_needed()
+
+    def _match(self, triple_pattern: Tuple[Any, Any, Any]) -> Iterator[Tuple[int, int, int]]:
+        """
+        A generator over the id triples matching the pattern.
+        """
+        self._finish_bulk_load()
+        key = []
+        for term in triple_pattern:
+            if term is ANY:
+                key.append(None)
+            else:
+                term_id = self._term2id.get(term)
+                if term_id is None:
+                    return
+                key.append(term_id)
+        s, p, o = key
+
+        # choose the permutation in which the bound terms form a prefix
+        if s is not None:
+            if p is None and o is not None:
+                order, prefix = OSP, (o, s)
+            else:
+                order, prefix = SPO, (s, p, o)
+        elif p is not None:
+            order, prefix = POS, (p, o, s)
+        else:
+            order, prefix = OSP, (o, s, p)
+        prefix = tuple(prefix[:prefix.index(None)] if None in prefix else prefix)
+
+        # keep references, so that a compaction during iteration does not affect this generator
+        columns = self._permutations[order]
+        removed = self._removed
+        added, added_index = self._added, self._added_index
+        lo, hi = self._range(columns, prefix)
+        si, pi, oi = (order.index(position) for position in range(3))
+        for i in range(lo, hi):
+            row = (columns[0][i], columns[1][i], columns[2][i])
+            ids = (row[si], row[pi], row[oi])
+            if ids not in removed:
+                yield ids
+
+        candidates = added
+        for position, term_id in enumerate(key):
+            if term_id is not None:
+                bucket = added_index[position].get(term_id, ())
+                if len(bucket) < len(candidates):
+                    candidates = bucket
+        for ids in list(candidates):
+            if all(term_id is None or term_id == ids[position] for position, term_id in enumerate(key)):
+                yield ids
+
+    def triples(
+        self,
+        triple_pattern: Tuple[Any, Any, Any],
+        context: Optional[Any] = None,
+    ) -> Iterator[Tuple[Tuple[Any, Any, Any], Iterator[Any]]]:
+        """A generator over all the triples matching"""
+        id2term = self._id2term
+        for s, p, o in self._match(triple_pattern):
+            yield (id2term[s], id2term[p], id2term[o]), self._contexts()
+
+    def __len__(self, context: Optional[Any] = None) -> int:
+        self._finish_bulk_load()
+        return len(self._permutations[SPO][0]) - len(self._removed) + len(self._added)
+
+    def _compact_if_needed(self) -> None:
+        if len(self._added) + len(self._removed) > self.delta_size:
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        Merge the delta buffer (and a running bulk load) into the sorted permutations.
+        """
+        bulk, self._bulk = self._bulk, None
+        if not self._added and not self._removed and not (bulk and len(bulk[0])):
+            return
+
+        # rows are packed into a single integer, which is much smaller than a tuple while sorting
+        base = len(self._id2term)
+
+        def pack(row: Tuple[int, int, int]) -> int:
+            return (row[0] * base + row[1]) * base + row[2]
+
+        permutations = {}
+        for order, columns in self._permutations.items():
+            new_rows = self._added if bulk is None else itertools.chain(self._added, zip(*bulk))
+            added = sorted(pack((ids[order[0]], ids[order[1]], ids[order[2]])) for ids in new_rows)
+            removed = {pack((ids[order[0]], ids[order[1]], ids[order[2]])) for ids in self._removed}
+            merged = self._empty_columns()
+            previous = None
+            for key in heapq.merge(map(pack, zip(*columns)), added):
+                # a bulk load may contain duplicates
+                if key == previous or key in removed:
+                    continue
+                previous = key
+                rest, third = divmod(key, base)
+                first, second = divmod(rest, base)
+                merged[0].append(first)
+                merged[1].append(second)
+                merged[2].append(third)
+            permutations[order] = merged
+        self._permutations = permutations
+        self._added = set()
+        self._removed = set()
+        self._added_index = ({}, {}, {})
+
+    def bind(self, prefix: str, namespace: Any, override: bool = True) -> None:
+        bound_namespace = self._namespace.get(prefix)
+        bound_prefix = self._prefix.get(namespace)
+        if bound_prefix is None and bound_namespace is not None:
+            bound_prefix = self._prefix.get(bound_namespace)
+        if override:
+            if bound_prefix is not None:
+                del self._namespace[bound_prefix]
+            if bound_namespace is not None:
+                del self._prefix[bound_namespace]
+            self._prefix[namespace] = prefix
+            self._namespace[prefix] = namespace
+        else:
+            namespace = bound_namespace if bound_namespace is not None else namespace
+            prefix = bound_prefix if bound_prefix is not None else prefix
+            self._prefix[namespace] = prefix
+            self._namespace[prefix] = namespace
+
+    def namespace(self, prefix: str) -> Optional[Any]:
+        return self._namespace.get(prefix, None)
+
+    def prefix(self, namespace: Any) -> Optional[str]:
+        return self._prefix.get(namespace, None)
+
+    def namespaces(self) -> Iterator[Tuple[str, Any]]:
+        for prefix, namespace in self._namespace.items():
+            yield prefix, namespace
+
+    def _contexts(self) -> Iterator[Any]:
+        return iter(())
@@ -10,7 +10,9 @@ from KG_Search_Toolkit import KGSearchToolkit
 from rdf_graph import RdfGraph
 model = RdfGraph()
 #model = RdfGraph(source_file="myKB.ttl") 
+#model = RdfGraph(source_file="myKB.ttl", store="Compact")
 #model = RdfGraph(query_endpoint="http://dbpedia.org/sparql")
+#model = RdfGraph(query_endpoint="http://dbpedia.org/sparql", mirror_schema=True, mirror_file="dbpedia_schema.ttl")
 
 base_uri = "http://myKB.org/"
 return_full_uri = True
@@ -1,8 +1,38 @@
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import itertools
+import logging
+import os
 import random
 import sys
+import threading
+import time
 import rdflib
 
+# allows to select the integer encoded store via RdfGraph(store="Compact")
+rdflib.plugin.register("Compact", rdflib.store.Store, "compact_store", "CompactStore")
+
+logger = logging.getLogger(__name__)
+
+# subject of the triples in a mirror file which describe for which endpoint and language it was written
+MIRROR_METADATA = rdflib.URIRef("urn:llms4ie:schema-mirror")
+
+SCHEMA_TYPES = [
+    rdflib.RDFS.Class,
+    rdflib.OWL.Class,
+    rdflib.RDF.Property,
+    rdflib.OWL.ObjectProperty,
+    rdflib.OWL.DatatypeProperty,
+]
+
+SCHEMA_PREDICATES = [
+    rdflib.RDFS.label,
+    rdflib.RDFS.comment,
+    rdflib.RDFS.domain,
+    rdflib.RDFS.range,
+    rdflib.RDFS.subClassOf,
+    rdflib.RDFS.subPropertyOf,
+]
+
 class RdfGraph:
 
     def __init__(
@@ -12,11 +42,23 @@ class RdfGraph:
         query_endpoint: Optional[str] = None,
         update_endpoint: Optional[str] = None,
         graph_kwargs: Optional[Dict] = None,
+        store: Union[str, rdflib.store.Store] = "default",
+        mirror_schema: bool = False,
+        mirror_ttl: Optional[float] = 3600,
+        mirror_file: Optional[str] = None,
+        mirror_page_size: int = 10000,
+        mirror_language: Optional[str] = "en",
     ) -> None:
         self.source_file = source_file
         self.serialization = serialization
         self.query_endpoint = query_endpoint
         self.update_endpoint = update_endpoint
+        self.store = store
+        self.mirror_schema = mirror_schema
+        self.mirror_ttl = mirror_ttl
+        self.mirror_file = mirror_file
+        self.mirror_page_size = mirror_page_size
+        self.mirror_language = mirror_language
 
         try:
             import rdflib
@@ -33,10 +75,24 @@ class RdfGraph:
                 "Specify either a file (local or online) via the source_file "
                 "or a triple store via the endpoints."
             )
+
+        if store != "default" and (query_endpoint or update_endpoint):
+            raise ValueError(
+                "A local store can not be combined with a remote triple store "
+                "given via the endpoints."
+            )
+
+        if mirror_schema and not query_endpoint:
+            raise ValueError(
+                "A schema mirror can only be used together with a query_endpoint."
+            )
         
-        self.graph = rdflib.Graph()
+        self.graph = rdflib.Graph(store=store)
         if source_file:            
+            if hasattr(self.graph.store, "start_bulk_load"):
+                self.graph.store.start_bulk_load()
             self.graph.parse(source_file, format=self.serialization)
+            self.compact()
 
         if query_endpoint:
             if not update_endpoint:
@@ -48,19 +104,172 @@ class RdfGraph:
             graph_kwargs = graph_kwargs or {}
             self.graph = rdflib.Graph(self._store, **graph_kwargs)
 
+        self._mirror = None
+        self._mirror_lock = threading.Lock()
+        self._mirror_pending = None
+        self._mirror_stop = threading.Event()
+        self._indexed = False
+        # duplicate -> canonical URI of the resources merged by merge_duplicates
+        self._redirects: Dict[rdflib.URIRef, rdflib.URIRef] = {}
+        # owl:sameAs links of a remote endpoint are too many to scan for redirects
+        if not query_endpoint:
+            self._load_redirects()
+        if mirror_schema:
+            self._start_mirror()
+
+    @property
+    def schema_graph(self) -> rdflib.Graph:
+        """
+        The graph which answers schema lookups (the local mirror if enabled).
+        """
+        if self._mirror is not None:
+            return self._mirror
+        return self.graph
+
+    def _start_mirror(self) -> None:
+        """
+        Load the schema mirror (from the mirror file if still fresh) and start the background refresh.
+        """
+        first_refresh = self.mirror_ttl
+        if self.mirror_file and os.path.exists(self.mirror_file):
+            age = time.time() - os.path.getmtime(self.mirror_file)
+            if self.mirror_ttl is None or age < self.mirror_ttl:
+                mirror = rdflib.Graph()
+                mirror.parse(self.mirror_file, format=self.mirror_file.split(".")[-1])
+                if self._mirror_metadata_matches(mirror):
+                    mirror.remove((MIRROR_METADATA, None, None))
+                    self._mirror = mirror
+                    if self.mirror_ttl:
+                        first_refresh = self.mirror_ttl - age
+        if self._mirror is None:
+            self.refresh_mirror()
+
+        if self.mirror_ttl:
+            thread = threading.Thread(target=self._mirror_refresh_loop, args=(first_refresh,), daemon=True)
+            thread.start()
+
+    def _mirror_metadata_matches(self, mirror: rdflib.Graph) -> bool:
+        """
+        Check that a mirror file was written for this endpoint and language.
+        """
+        endpoint = mirror.value(MIRROR_METADATA, rdflib.DCTERMS.source)
+        language = mirror.value(MIRROR_METADATA, rdflib.DCTERMS.language)
+        return (
+            endpoint == rdflib.URIRef(self.query_endpoint)
+            and (str(language) if language is not None else None) == self.mirror_language
+        )
+
+    def _serialize_mirror(self, mirror: rdflib.Graph) -> None:
+        """
+        Write the mirror to the mirror file together with the endpoint and language it belongs to.
+        """
+        metadata = [(MIRROR_METADATA, rdflib.DCTERMS.source, rdflib.URIRef(self.query_endpoint))]
+        if self.mirror_language:
+            metadata.append((MIRROR_METADATA, rdflib.DCTERMS.language, rdflib.Literal(self.mirror_language)))
+        for triple in metadata:
+            mirror.add(triple)
+        try:
+            mirror.serialize(destination=self.mirror_file, format=self.mirror_file.split(".")[-1])
+        finally:
+            mirror.remove((MIRROR_METADATA, None, None))
+
+    def _mirror_refresh_loop(self, first_refresh: float) -> None:
+        wait = first_refresh
+        while not self._mirror_stop.wait(wait):
+            wait = self.mirror_ttl
+            try:
+                self.refresh_mirror()
+            except Exception:
+                # keep serving the old mirror, a stale schema is better than none
+                logger.warning("Could not refresh the schema mirror of %s", self.query_endpoint, exc_info=True)
+
+    def stop_mirror_refresh(self) -> None:
+        """
+        Stop the background refresh of the schema mirror.
+        """
+        self._mirror_stop.set()
+
+    def _fetch_schema(self) -> rdflib.Graph:
+        """
+        Fetch classes and properties with labels, comments, domain and range from the endpoint with paged CONSTRUCT queries.
+        """
+        predicates = " ".join(f"<{p}>" for p in SCHEMA_PREDICATES)
+        language_filter = ""
+        if self.mirror_language:
+            language_filter = f'FILTER (!isLiteral(?o) || lang(?o) = "" || langMatches(lang(?o), "{self.mirror_language}"))'
+
+        mirror = rdflib.Graph()
+        for schema_type in SCHEMA_TYPES:
+            offset = 0
+            while True:
+                result = self.graph.query(f"""
+                CONSTRUCT {{ ?s a <{schema_type}> . ?s ?p ?o . }}
+                WHERE {{
+                    ?s a <{schema_type}> .
+                    OPTIONAL {{
+                        ?s ?p ?o .
+                        VALUES ?p {{ {predicates} }}
+                        {language_filter}
+                    }}
+                }}
+                ORDER BY ?s ?p ?o
+                LIMIT {self.mirror_page_size}
+                OFFSET {offset}
+                """)
+                triples = list(result)
+                if not triples:
+                    break
+                for triple in triples:
+                    mirror.add(triple)
+                offset += self.mirror_page_size
+        return mirror
+
+    def refresh_mirror(self) -> None:
+        """
+        Rebuild the local schema mirror from the endpoint.
+        """
+        with self._mirror_lock:
+            self._mirror_pending = []
+        try:
+            mirror = self._fetch_schema()
+        except Exception:
+            with self._mirror_lock:
+                self._mirror_pending = None
+            raise
+        with self._mirror_lock:
+            # replay schema changes which were written while the mirror was fetched
+            for added, triple in self._mirror_pending:
+                if added:
+                    mirror.add(triple)
+                else:
+                    mirror.remove(triple)
+            self._mirror_pending = None
+            self._mirror = mirror
+            self._indexed = False
+            if self.mirror_file:
+                self._serialize_mirror(mirror)
+
+    def _is_schema_triple(self, triple: tuple) -> bool:
+        s, p, o = triple
+        if p == rdflib.RDF.type:
+            return o in SCHEMA_TYPES
+        return p in SCHEMA_PREDICATES and (s, None, None) in self._mirror
+
 
     def query_return_full_result(
         self,
         query: str,
+        schema_only: bool = False,
     ) -> List[rdflib.query.ResultRow]:
         """
-        Query the graph.
+        Query the graph (or only the schema mirror if schema_only is set).
         """
         from rdflib.exceptions import ParserError
         from rdflib.query import ResultRow
 
+        graph = self.schema_graph if schema_only else self.graph
         try:
-            return self.graph.query(query)
+            return graph.query(query)
         except ParserError as e:
             raise ValueError("Generated SPARQL statement is invalid\n" f"{e}")
 
@@ -69,15 +278,17 @@ class RdfGraph:
     def query(
         self,
         query: str,
+        schema_only: bool = False,
     ) -> List[rdflib.query.ResultRow]:
         """
-        Query the graph.
+        Query the graph (or only the schema mirror if schema_only is set).
         """
         from rdflib.exceptions import ParserError
         from rdflib.query import ResultRow
 
+        graph = self.schema_graph if schema_only else self.graph
         try:
-            res = self.graph.query(query)
+            res = graph.query(query)
         except ParserError as e:
             raise ValueError("Generated SPARQL statement is invalid\n" f"{e}")
         return [r for r in res if isinstance(r, ResultRow)]
@@ -105,6 +316,7 @@ class RdfGraph:
 
         try:
             self.graph.update(query)
+            self._indexed = False
         except ParserError as e:
             raise ValueError("Generated SPARQL statement is invalid\n" f"{e}")
 
@@ -125,6 +337,13 @@ class RdfGraph:
         return self.query(query)
 
     
+    def compact(self) -> None:
+        """
+        Merge pending writes into the sorted indexes if the store supports it (e.g. the Compact store).
+        """
+        if hasattr(self.graph.store, "compact"):
+            self.graph.store.compact()
+
     def add(
         self,
         triple: tuple,
@@ -133,22 +352,78 @@ class RdfGraph:
         Add triple to the graph.
         """
         self.graph.add(triple)
+        self._add_to_mirror(triple)
+        self._add_to_index(triple)
 
     def add_triples(
         self,
         triples: List[tuple],
     ) -> None:
         """
-        Add triples to the graph.
+        Add triples to the graph (a remote store receives them in one update).
         """
+        self.graph.addN((s, p, o, self.graph) for s, p, o in triples)
         for triple in triples:
-            self.graph.add(triple)
+            self._add_to_mirror(triple)
+            self._add_to_index(triple)
+
+    def remove(
+        self,
+        triple: tuple,
+    ) -> None:
+        """
+        Remove triples matching the pattern from the graph.
+        """
+        self.graph.remove(triple)
+        self._remove_from_mirror_and_index(triple)
+
+    def remove_triples(
+        self,
+        triples: List[tuple],
+    ) -> None:
+        """
+        Remove triples from the graph (a remote store receives them in one update).
+        """
+        from rdflib.plugins.stores.sparqlstore import SPARQLUpdateStore
+
+        if not triples:
+            return
+        if isinstance(self.graph.store, SPARQLUpdateStore):
+            data = " ".join(f"{s.n3()} {p.n3()} {o.n3()} ." for s, p, o in triples)
+            self.update(f"DELETE DATA {{ {data} }}")
+        else:
+            for triple in triples:
+                self.graph.remove(triple)
+        for triple in triples:
+            self._remove_from_mirror_and_index(triple)
+
+    def _remove_from_mirror_and_index(self, triple: tuple) -> None:
+        self._remove_from_index(triple)
+        if self._mirror is not None:
+            with self._mirror_lock:
+                self._mirror.remove(triple)
+                if self._mirror_pending is not None:
+                    self._mirror_pending.append((False, triple))
+
+    def _add_to_mirror(self, triple: tuple) -> None:
+        """
+        Write a schema triple through to the mirror.
+        """
+        if self._mirror is None:
+            return
+        with self._mirror_lock:
+            if self._is_schema_triple(triple):
+                self._mirror.add(triple)
+                if self._mirror_pending is not None:
+                    self._mirror_pending.append((True, triple))
 
 
     def URI_exists(self, uri : str) -> bool:
         """
         Check if a URI exists in the graph.
         """
+        if self._mirror is not None and (rdflib.URIRef(uri), None, None) in self._mirror:
+            return True
         return (rdflib.URIRef(uri), None, None) in self.graph
     
 
@@ -156,13 +431,15 @@ class RdfGraph:
         """
         Check if a URI exists in the graph and is a class.
         """
-        return (rdflib.URIRef(uri), rdflib.RDF.type, rdflib.RDFS.Class) in self.graph or (rdflib.URIRef(uri), rdflib.RDF.type, rdflib.OWL.Class) in self.graph
+        graph = self.schema_graph
+        return (rdflib.URIRef(uri), rdflib.RDF.type, rdflib.RDFS.Class) in graph or (rdflib.URIRef(uri), rdflib.RDF.type, rdflib.OWL.Class) in graph
     
     def URI_is_property(self, uri : str) -> bool:
         """
         Check if a URI exists in the graph and is a class.
         """
-        return (rdflib.URIRef(uri), rdflib.RDF.type, rdflib.RDF.Property) in self.graph or (rdflib.URIRef(uri), rdflib.RDF.type, rdflib.OWL.ObjectProperty) in self.graph or (rdflib.URIRef(uri), rdflib.RDF.type, rdflib.OWL.DatatypeProperty) in self.graph
+        graph = self.schema_graph
+        return (rdflib.URIRef(uri), rdflib.RDF.type, rdflib.RDF.Property) in graph or (rdflib.URIRef(uri), rdflib.RDF.type, rdflib.OWL.ObjectProperty) in graph or (rdflib.URIRef(uri), rdflib.RDF.type, rdflib.OWL.DatatypeProperty) in graph
     
     def append_random_number(self, base_uri : str) -> str:
         """
@@ -189,4 +466,324 @@ class RdfGraph:
             while self.URI_exists(uri):
                 i += 1
                 uri = full_uri + "_" + str(i)
-            return uri
\ No newline at end of file
+            return uri
+
+    def _load_redirects(self) -> None:
+        """
+        Read back the redirects of earlier merges: owl:sameAs links of resources without any other triple.
+        """
+        for duplicate, canonical in self.graph.subject_objects(rdflib.OWL.sameAs):
+            if not isinstance(duplicate, rdflib.URIRef) or not isinstance(canonical, rdflib.URIRef):
+                continue
+            if all(p == rdflib.OWL.sameAs for p in self.graph.predicates(duplicate)) and len(set(self.graph.objects(duplicate, rdflib.OWL.sameAs))) == 1:
+                self._redirects[duplicate] = canonical
+
+    def resolve_URI(self, uri : str) -> str:
+        """
+        Follow the redirects recorded by merge_duplicates to the canonical URI.
+        """
+        seen = set()
+        current = rdflib.URIRef(uri)
+        while current in self._redirects and current not in seen:
+            seen.add(current)
+            current = self._redirects[current]
+        return str(current)
+
+    @staticmethod
+    def _normalize_text(text: str) -> str:
+        return " ".join(str(text).casefold().split())
+
+    def _duplicate_key(self, resource: rdflib.URIRef) -> tuple:
+        """
+        Key under which resources are considered duplicates: normalized labels and comments plus the types
+        (and domain/range for properties).
+        """
+        return (
+            frozenset(self._normalize_text(l) for l in self.graph.objects(resource, rdflib.RDFS.label)),
+            frozenset(self._normalize_text(c) for c in self.graph.objects(resource, rdflib.RDFS.comment)),
+            frozenset(self.graph.objects(resource, rdflib.RDF.type)),
+            frozenset(self.graph.objects(resource, rdflib.RDFS.domain)),
+            frozenset(self.graph.objects(resource, rdflib.RDFS.range)),
+        )
+
+    def _find_duplicates(self, uris: Optional[Iterable[str]] = None) -> Dict[rdflib.URIRef, rdflib.URIRef]:
+        """
+        Map every duplicate resource to its canonical resource.
+        """
+        # blocking: only resources sharing a normalized label are compared
+        blocks: Dict[str, set] = {}
+        if uris is None:
+            labelled = self.graph.subject_objects(rdflib.RDFS.label)
+        else:
+            texts = {
+                self._normalize_text(label)
+                for uri in uris
+                for label in self.graph.objects(rdflib.URIRef(uri), rdflib.RDFS.label)
+            }
+            if self.query_endpoint:
+                labelled = (
+                    (s, label)
+                    for s, label in self.graph.subject_objects(rdflib.RDFS.label)
+                    if self._normalize_text(label) in texts
+                )
+            else:
+                self._ensure_index()
+                labelled = [(s, text) for text in texts for s in self._label_index.get(text, ())]
+        for s, label in labelled:
+            if isinstance(s, rdflib.URIRef):
+                blocks.setdefault(self._normalize_text(label), set()).add(s)
+
+        candidates = set()
+        for block in blocks.values():
+            if len(block) > 1:
+                candidates.update(block)
+
+        groups: Dict[tuple, List[rdflib.URIRef]] = {}
+        for resource in candidates:
+            groups.setdefault(self._duplicate_key(resource), []).append(resource)
+
+        requested = None if uris is None else {rdflib.URIRef(uri) for uri in uris}
+        mapping = {}
+        for group in groups.values():
+            if len(group) < 2:
+                continue
+            if requested is not None and requested.isdisjoint(group):
+                continue
+            # prefer speaking and short URIs, i.e. Label over Label_1 or a random number
+            canonical = min(group, key=lambda uri: (sum(c.isdigit() for c in uri), len(uri), uri))
+            for resource in group:
+                if resource != canonical:
+                    mapping[resource] = canonical
+        return mapping
+
+    def merge_duplicates(
+        self,
+        uris: Optional[Iterable[str]] = None,
+        record_same_as: bool = True,
+    ) -> Dict[str, int]:
+        """
+        Merge duplicate classes, properties and instances (same normalized label, comment and type) into one
+        canonical URI and rewrite all referencing triples. If uris are given, only duplicates of these (and of
+        resources which become duplicates through these merges) are merged.
+        The merges are remembered for resolve_URI and (if record_same_as is set) stored as owl:sameAs links,
+        which are read back when the graph is loaded again.
+        Orphaned schema entries are intentionally not removed: all references to a duplicate are rewritten to
+        its canonical resource, so a merge leaves nothing orphaned behind, and deleting unreferenced resources
+        would also delete data the merge never touched.
+        Returns how many resources were merged and how many triples were saved.
+        """
+        reflexive_predicates = {
+            rdflib.RDFS.subClassOf,
+            rdflib.RDFS.subPropertyOf,
+            rdflib.OWL.sameAs,
+            rdflib.OWL.equivalentClass,
+            rdflib.OWL.equivalentProperty,
+        }
+        triples_before = len(self.graph)
+        merged_resources = 0
+
+        # repeat, because merged classes (or properties) can turn their instances (or sub properties) into duplicates
+        while True:
+            mapping = self._find_duplicates(uris)
+            if not mapping:
+                break
+            merged_resources += len(mapping)
+            self._redirects.update(mapping)
+
+            referencing = set()
+            for duplicate in mapping:
+                referencing.update(self.graph.triples((duplicate, None, None)))
+                referencing.update(self.graph.triples((None, duplicate, None)))
+                referencing.update(self.graph.triples((None, None, duplicate)))
+
+            rewritten = set()
+            for triple in referencing:
+                # the canonical resource already has the same (normalized) labels and comments
+                if triple[0] in mapping and triple[1] in (rdflib.RDFS.label, rdflib.RDFS.comment):
+                    continue
+                s, p, o = (mapping.get(term, term) for term in triple)
+                if s == o and p in reflexive_predicates:
+                    continue
+                rewritten.add((s, p, o))
+
+            self.remove_triples(list(referencing))
+            if record_same_as:
+                rewritten.update((duplicate, rdflib.OWL.sameAs, canonical) for duplicate, canonical in mapping.items())
+            self.add_triples(list(rewritten))
+
+            if uris is not None:
+                # resources whose type, domain or range was rewritten can now be duplicates as well
+                key_predicates = (rdflib.RDF.type, rdflib.RDFS.domain, rdflib.RDFS.range)
+                changed = {
+                    mapping.get(s, s)
+                    for s, p, o in referencing
+                    if o in mapping and p in key_predicates
+                }
+                uris = {mapping.get(rdflib.URIRef(uri), rdflib.URIRef(uri)) for uri in uris} | changed
+
+        self.compact()
+
+        triples_after = len(self.graph)
+        return {
+            "merged_resources": merged_resources,
+            "triples_before": triples_before,
+            "triples_after": triples_after,
+            "triples_saved": triples_before - triples_after,
+        }
+
+    def _build_index(self) -> None:
+        """
+        Precompute the domain/range, subclass and type indexes used by the candidate lookups.
+        """
+        self._domain_index: Dict[rdflib.URIRef, set] = {}
+        self._range_index: Dict[rdflib.URIRef, set] = {}
+        self._superclass_index: Dict[rdflib.URIRef, set] = {}
+        self._subclass_index: Dict[rdflib.URIRef, set] = {}
+        # class -> instances, a dict is used as an ordered set to allow stable pagination
+        self._instance_index: Dict[rdflib.URIRef, Dict[rdflib.URIRef, None]] = {}
+        # normalized label -> resources, used to find duplicates of single resources
+        self._label_index: Dict[str, set] = {}
+        # class -> instances of the class and all its sub classes, filled by instances_of_class
+        self._instance_union_cache: Dict[rdflib.URIRef, List[rdflib.URIRef]] = {}
+
+        schema = self.schema_graph
+        for predicate in (rdflib.RDFS.domain, rdflib.RDFS.range, rdflib.RDFS.subClassOf):
+            for s, o in schema.subject_objects(predicate):
+                self._index_triple((s, predicate, o))
+        # instances of a remote endpoint are too many to index, they are queried page by page instead
+        if not self.query_endpoint:
+            for predicate in (rdflib.RDF.type, rdflib.RDFS.label):
+                for s, o in self.graph.subject_objects(predicate):
+                    self._index_triple((s, predicate, o))
+        # only mark the indexes as valid once they are completely built
+        self._indexed = True
+
+    def _index_triple(self, triple: tuple) -> None:
+        s, p, o = triple
+        if p == rdflib.RDFS.domain:
+            self._domain_index.setdefault(o, set()).add(s)
+        elif p == rdflib.RDFS.range:
+            self._range_index.setdefault(o, set()).add(s)
+        elif p == rdflib.RDFS.subClassOf:
+            self._superclass_index.setdefault(s, set()).add(o)
+            self._subclass_index.setdefault(o, set()).add(s)
+            self._instance_union_cache.clear()
+        elif p == rdflib.RDF.type and not self.query_endpoint:
+            self._instance_index.setdefault(o, {})[s] = None
+            self._clear_instance_union_cache(o)
+        elif p == rdflib.RDFS.label and not self.query_endpoint:
+            self._label_index.setdefault(self._normalize_text(o), set()).add(s)
+
+    def _add_to_index(self, triple: tuple) -> None:
+        """
+        Keep the indexes up to date (they are only built on first use).
+        """
+        if self._indexed:
+            self._index_triple(triple)
+
+    def _remove_from_index(self, triple: tuple) -> None:
+        """
+        Update the indexes after a triple was removed (a pattern invalidates them).
+        """
+        if not self._indexed:
+            return
+        s, p, o = triple
+        if s is None or p is None or o is None:
+            self._indexed = False
+        elif p == rdflib.RDFS.domain:
+            self._domain_index.get(o, set()).discard(s)
+        elif p == rdflib.RDFS.range:
+            self._range_index.get(o, set()).discard(s)
+        elif p == rdflib.RDFS.subClassOf:
+            self._superclass_index.get(s, set()).discard(o)
+            self._subclass_index.get(o, set()).discard(s)
+            self._instance_union_cache.clear()
+        elif p == rdflib.RDF.type and not self.query_endpoint:
+            self._instance_index.get(o, {}).pop(s, None)
+            self._clear_instance_union_cache(o)
+        elif p == rdflib.RDFS.label and not self.query_endpoint:
+            text = self._normalize_text(o)
+            # another label of the resource can have the same normalized text
+            if all(self._normalize_text(label) != text for label in self.graph.objects(s, rdflib.RDFS.label)):
+                self._label_index.get(text, set()).discard(s)
+
+    def _clear_instance_union_cache(self, class_uri: rdflib.URIRef) -> None:
+        """
+        Drop the cached instance lists which contain the instances of the class.
+        """
+        if self._instance_union_cache:
+            for c in self._closure(class_uri, self._superclass_index):
+                self._instance_union_cache.pop(c, None)
+
+    def _ensure_index(self) -> None:
+        if not self._indexed:
+            self._build_index()
+
+    @staticmethod
+    def _closure(start: rdflib.URIRef, index: Dict[rdflib.URIRef, set]) -> List[rdflib.URIRef]:
+        """
+        The start class followed by all classes transitively reachable in the index.
+        """
+        result = [start]
+        seen = {start}
+        for current in result:
+            for other in index.get(current, ()):
+                if other not in seen:
+                    seen.add(other)
+                    result.append(other)
+        return result
+
+    def applicable_properties(
+        self,
+        subject_class: Optional[str] = None,
+        object_class: Optional[str] = None,
+    ) -> List[rdflib.URIRef]:
+        """
+        Get the properties whose domain is the subject class (or one of its super classes)
+        and whose range is the object class (or one of its super classes).
+        """
+        self._ensure_index()
+        properties = None
+        for class_uri, index in ((subject_class, self._domain_index), (object_class, self._range_index)):
+            if not class_uri:
+                continue
+            candidates = set()
+            for c in self._closure(rdflib.URIRef(class_uri), self._superclass_index):
+                candidates.update(index.get(c, ()))
+            properties = candidates if properties is None else properties & candidates
+        return sorted(properties or [])
+
+    def instances_of_class(
+        self,
+        class_uri: str,
+        offset: int = 0,
+        limit: int = 20,
+    ) -> Tuple[List[rdflib.URIRef], int]:
+        """
+        Get a page of instances of a class (including instances of its sub classes) and the total number of instances.
+        """
+        self._ensure_index()
+        classes = self._closure(rdflib.URIRef(class_uri), self._subclass_index)
+
+        if self.query_endpoint:
+            values = " ".join(f"<{c}>" for c in classes)
+            total = self.query(f"""
+            SELECT (COUNT(DISTINCT ?instance) AS ?count)
+            WHERE {{ ?instance a ?type . VALUES ?type {{ {values} }} }}
+            """)[0][0]
+            rows = self.query(f"""
+            SELECT DISTINCT ?instance
+            WHERE {{ ?instance a ?type . VALUES ?type {{ {values} }} }}
+            ORDER BY ?instance
+            LIMIT {limit}
+            OFFSET {offset}
+            """)
+            return [row[0] for row in rows], int(total)
+
+        instances = self._instance_union_cache.get(classes[0])
+        if instances is None:
+            # an instance can be typed with several classes of the hierarchy
+            instance_sets = [self._instance_index.get(c, {}) for c in classes]
+            instances = list(dict.fromkeys(itertools.chain.from_iterable(instance_sets)))
+            self._instance_union_cache[classes[0]] = instances
+        return instances[offset:offset + limit], len(instances)